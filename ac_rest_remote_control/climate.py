@@ -3,15 +3,13 @@
 from __future__ import annotations
 
 import asyncio
-from dataclasses import dataclass
 from datetime import datetime, timedelta
 import logging
-from typing import Any
-
-import requests
-from requests.auth import HTTPBasicAuth
-import json
+from types import MappingProxyType
+from typing import Any, NamedTuple
 
+import aiohttp
+import orjson
 import voluptuous as vol
 
 from homeassistant.components.climate import (
@@ -55,7 +53,9 @@ from homeassistant.core import (
     callback,
 )
 
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.event import (
     async_track_state_change_event,
@@ -71,6 +71,10 @@ _LOGGER = logging.getLogger(__name__)
 
 DEFAULT_NAME = "AC Remote"
 DEFAULT_TARGET_TEMPERATURE = 24
+# Delay used to coalesce rapid setting changes into a single command
+COMMAND_DEBOUNCE_COOLDOWN = 0.25
+# Upper bound for the retry back-off exponent (2**6 = 64 seconds)
+MAX_FAIL_STREAK = 6
 
 CONF_MIN_TEMP = "min_temp"
 CONF_MAX_TEMP = "max_temp"
@@ -85,6 +89,9 @@ CONF_REST_URL = "rest_url"
 CONF_REST_USERNAME = "rest_username"
 CONF_REST_PASSWORD = "rest_password"
 
+_FAN_STR = "FAN_AUTO"
+_SUPPORTED_HVAC = {HVACMode.HEAT, HVACMode.COOL, HVACMode.OFF}
+
 CONF_PRESETS = {
     p: f"{p}_temp"
     for p in (
@@ -177,8 +184,7 @@ async def async_setup_platform(
     )
 
 
-@dataclass
-class ACState:
+class ACState(NamedTuple):
     temperature: int | None = None
     mode: HVACMode | None = None
 
@@ -187,6 +193,14 @@ class ACRemoteControl(ClimateEntity, RestoreEntity):
 
     _attr_should_poll = False
     _enable_turn_on_off_backwards_compatibility = False
+    _debouncer: Debouncer
+    _HEADERS = {"Content-Type": "application/json"}
+    # (power, mode) sent to the AC control device; OFF keeps the cool mode
+    _MODE_TABLE = {
+        HVACMode.COOL: (True, "COOL_MODE"),
+        HVACMode.HEAT: (True, "HEAT_MODE"),
+        HVACMode.OFF: (False, "COOL_MODE"),
+    }
 
     def __init__(
             self,
@@ -211,9 +225,15 @@ class ACRemoteControl(ClimateEntity, RestoreEntity):
         self._attr_name = name
         self.ac_mode = ac_mode
         self.min_cycle_duration = min_cycle_duration
+        self._min_cycle_seconds = (
+            min_cycle_duration.total_seconds() if min_cycle_duration else None
+        )
         self._keep_alive = keep_alive
-        self._hvac_mode = initial_hvac_mode
-        self._saved_target_temp = target_temp or next(iter(presets.values()), None)
+        # Store a HVACMode member so mode checks can compare by identity
+        self._hvac_mode = HVACMode(initial_hvac_mode) if initial_hvac_mode else None
+        self._saved_target_temp = target_temp
+        if target_temp is None and presets:
+            self._saved_target_temp = next(iter(presets.values()))
         self._temp_precision = precision
         self._temp_target_temperature_step = target_temperature_step
         if self.ac_mode:
@@ -233,27 +253,41 @@ class ACRemoteControl(ClimateEntity, RestoreEntity):
                 | ClimateEntityFeature.TURN_OFF
                 | ClimateEntityFeature.TURN_ON
         )
-        if len(presets):
+        if presets:
             self._attr_supported_features |= ClimateEntityFeature.PRESET_MODE
-            self._attr_preset_modes = [PRESET_NONE, *presets.keys()]
+            self._attr_preset_modes = [PRESET_NONE, *presets]
         else:
             self._attr_preset_modes = [PRESET_NONE]
-        self._presets = presets
+        self._preset_modes_set = frozenset(self._attr_preset_modes)
+        self._presets = MappingProxyType(presets)
 
         # REST Remote part:
         self._is_last_send_succeed = False
+        self._fail_streak = 0
+        self._next_retry_at = 0.0
         self._last_send_state = None
-        self._last_control_action_time = datetime.now()
+        self._last_control_action_time = 0.0
         self._test_counter = 0
         self._last_state: ACState | None = None
         self._rest_url = rest_url
-        self._username = username
-        self._password = password
+        self._post_headers = {
+            **self._HEADERS,
+            "Authorization": aiohttp.BasicAuth(username, password).encode(),
+        }
 
     async def async_added_to_hass(self) -> None:
         """Run when entity about to be added."""
         await super().async_added_to_hass()
 
+        self._debouncer = Debouncer(
+            self.hass,
+            _LOGGER,
+            cooldown=COMMAND_DEBOUNCE_COOLDOWN,
+            immediate=False,
+            function=self._async_debounced_control_heating,
+        )
+        self.async_on_remove(self._debouncer.async_shutdown)
+
         if self._keep_alive:
             self.async_on_remove(
                 async_track_time_interval(
@@ -309,6 +343,11 @@ class ACRemoteControl(ClimateEntity, RestoreEntity):
             self._hvac_mode = HVACMode.OFF
 
         self._last_state = ACState(self.target_temperature, self.hvac_mode)
+        # The target temperature is always known at this point
+        self._active = True
+        _LOGGER.info(
+            "Obtained target temperature. AC Remote active. %s", self._target_temp
+        )
 
 
     @property
@@ -338,9 +377,9 @@ class ACRemoteControl(ClimateEntity, RestoreEntity):
         """
         if not self._is_last_send_succeed:
             return HVACAction.IDLE
-        if self._hvac_mode == HVACMode.HEAT:
+        if self._hvac_mode is HVACMode.HEAT:
             return HVACAction.HEATING
-        if self._hvac_mode == HVACMode.COOL:
+        if self._hvac_mode is HVACMode.COOL:
             return HVACAction.COOLING
         return HVACAction.OFF
 
@@ -351,20 +390,11 @@ class ACRemoteControl(ClimateEntity, RestoreEntity):
 
     async def async_set_hvac_mode(self, hvac_mode: HVACMode) -> None:
         """Set hvac mode."""
-        if hvac_mode == HVACMode.HEAT:
-            self._hvac_mode = HVACMode.HEAT
-            await self._async_control_heating()
-        elif hvac_mode == HVACMode.COOL:
-            self._hvac_mode = HVACMode.COOL
-            await self._async_control_heating()
-        elif hvac_mode == HVACMode.OFF:
-            self._hvac_mode = HVACMode.OFF
-            await self._async_control_heating()
-            # if self._is_device_active:
-            #     await self._async_heater_turn_off()
-        else:
+        if hvac_mode not in _SUPPORTED_HVAC:
             _LOGGER.error("Unrecognized hvac mode: %s", hvac_mode)
             return
+        self._hvac_mode = HVACMode(hvac_mode)
+        await self._debouncer.async_call()
         # Ensure we update the current operation after changing the mode
         self.async_write_ha_state()
 
@@ -373,7 +403,7 @@ class ACRemoteControl(ClimateEntity, RestoreEntity):
         if (temperature := kwargs.get(ATTR_TEMPERATURE)) is None:
             return
         self._target_temp = temperature
-        await self._async_control_heating()
+        await self._debouncer.async_call()
         self.async_write_ha_state()
 
     @property
@@ -396,7 +426,7 @@ class ACRemoteControl(ClimateEntity, RestoreEntity):
 
     async def _check_initial_state(self) -> None:
         """Prevent the device from keep running if HVACMode.OFF."""
-        if self._hvac_mode == HVACMode.OFF and self._is_device_active:
+        if self._hvac_mode is HVACMode.OFF and self._is_device_active:
             _LOGGER.warning(
                 (
                     "The climate mode is OFF, but the switch device is ON. Turning off"
@@ -409,69 +439,98 @@ class ACRemoteControl(ClimateEntity, RestoreEntity):
             self, time: datetime | None = None) -> None:
         """Check if we need to turn heating on or off."""
         # If the `time` argument is not none, we were invoked for keep-alive purposes.
-        async with self._temp_lock:
-            if not self._active and None not in (
-                    # self._cur_temp,
-                    self._target_temp,
-            ):
-                self._active = True
-                _LOGGER.info(
-                    (
-                        "Obtained current and target temperature. "
-                        "AC Remote  active. %s"
-                    ),
-                    self._target_temp,
-                )
+        if not self._active:  # or self._hvac_mode == HVACMode.OFF:
+            return
+        cur_state = ACState(self.target_temperature, self.hvac_mode)
+        if cur_state == self._last_state:
+            # Nothing changed since the last successful command
+            return
+        if self._is_backing_off(time):
+            # Back off keep-alive retries while the device keeps failing
+            return
 
-            if not self._active:  # or self._hvac_mode == HVACMode.OFF:
-                return
+        if self._is_device_active and self._is_min_cycle_elapsed():
+            async with self._temp_lock:
+                # A send may have finished while waiting, so check again
+                if self._is_backing_off(time) or not self._is_min_cycle_elapsed():
+                    return
+                # Take a fresh snapshot, the state may have changed while waiting
+                cur_state = ACState(self.target_temperature, self.hvac_mode)
+                await self._async_control_heating_command_sender(cur_state)
+
+    def _is_backing_off(self, time: datetime | None) -> bool:
+        """Return True if a keep-alive retry has to wait for the back-off delay."""
+        return (
+                not self._is_last_send_succeed
+                and time is not None
+                and self.hass.loop.time() < self._next_retry_at
+        )
 
-            if self._is_device_active:
-                long_enough = (datetime.now() - self._last_control_action_time) > self.min_cycle_duration
-                if long_enough:
-                    await self._async_control_heating_command_sender()
+    def _is_min_cycle_elapsed(self) -> bool:
+        """Return True if min_cycle_duration has passed since the last command."""
+        return self._min_cycle_seconds is None or (
+                self.hass.loop.time() - self._last_control_action_time
+        ) > self._min_cycle_seconds
+
+    async def _async_debounced_control_heating(self) -> None:
+        """Send the latest settings, repeating while they change during a send."""
+        # The debouncer drops calls made while this runs, so pick them up here
+        while True:
+            sent_state = self._last_state
+            await self._async_control_heating()
+            if ACState(self.target_temperature, self.hvac_mode) == self._last_state:
+                return
+            if self._last_state == sent_state:
+                # Nothing was sent, leave the rest to keep-alive or the next change
+                return
 
     @property
     def _is_device_active(self) -> bool | None:
         """Since there is no feedback from the air conditioner, we consider it to be always active."""
         return True
 
-    def _send_rest_command(self, payload: dict) -> None:
+    async def _send_rest_command(self, payload: dict) -> None:
         """Sending payload to AC control device with REST handler"""
-        credentials = HTTPBasicAuth(self._username, self._password)
-        headers = {'Content-Type': 'application/json'}
+        session = async_get_clientsession(self.hass)
         try:
-            _LOGGER.info("Sending request: [%s]: %s", str(self._rest_url), str(payload))
-            response = requests.post(self._rest_url, data=json.dumps(payload), headers=headers,
-                                     auth=credentials, timeout=3)
-            response.raise_for_status()
+            _LOGGER.info("Sending request: [%s]: %s", self._rest_url, payload)
+            async with session.post(self._rest_url, data=orjson.dumps(payload),
+                                    headers=self._post_headers,
+                                    timeout=aiohttp.ClientTimeout(total=3)) as response:
+                response.raise_for_status()
             self._is_last_send_succeed = True
+            self._fail_streak = 0
         except Exception as e:
             _LOGGER.warning("A requests error occurred: %s", e)
             self._is_last_send_succeed = False
+            self._fail_streak = min(self._fail_streak + 1, MAX_FAIL_STREAK)
+            self._next_retry_at = self.hass.loop.time() + 2**self._fail_streak
 
-    async def _async_control_heating_command_sender(self):
+    async def _async_control_heating_command_sender(self, cur_state: ACState) -> None:
         """Build and send new json-command to AC if configuration was changed since last sending"""
-        cur_state = ACState(self.target_temperature, self.hvac_mode)
         if self._last_state != cur_state:
-            _LOGGER.info("Something changed: %s", str(cur_state))
-            power_toggle = ((self._last_state.mode == HVACMode.OFF and cur_state.mode != HVACMode.OFF) or
-                            (self._last_state.mode != HVACMode.OFF and cur_state.mode == HVACMode.OFF))
+            _LOGGER.info("Something changed: %s", cur_state)
+            power_toggle = (self._last_state.mode is HVACMode.OFF) != (cur_state.mode is HVACMode.OFF)
+            power, mode_str = self._MODE_TABLE[cur_state.mode]
             payload = {
                 "power_toggle": power_toggle,
-                "power": self._hvac_mode != HVACMode.OFF,
-                "mode": "COOL_MODE" if (self._hvac_mode == HVACMode.COOL or self._hvac_mode == HVACMode.OFF) else "HEAT_MODE",
-                "fan": "FAN_AUTO",
-                "temperature": self.target_temperature
+                "power": power,
+                "mode": mode_str,
+                "fan": _FAN_STR,
+                "temperature": cur_state.temperature
             }
-            await self.hass.async_add_executor_job(self._send_rest_command, payload)
-            self._last_state = cur_state
-            self._last_control_action_time = datetime.now()
+            await self._send_rest_command(payload)
+            if self._is_last_send_succeed:
+                # Keep the old state on failure so the command is retried later
+                self._last_state = cur_state
+                self._last_control_action_time = self.hass.loop.time()
+            # hvac_action depends on the result of the send
+            self.async_write_ha_state()
 
     async def async_set_preset_mode(self, preset_mode: str) -> None:
         """Set new preset mode."""
         _LOGGER.info("Setting new preset mode: %s", preset_mode)
-        if preset_mode not in (self.preset_modes or []):
+        if preset_mode not in self._preset_modes_set:
             raise ValueError(
                 f"Got unsupported preset_mode {preset_mode}. Must be one of"
                 f" {self.preset_modes}"
@@ -482,11 +541,11 @@ class ACRemoteControl(ClimateEntity, RestoreEntity):
         if preset_mode == PRESET_NONE:
             self._attr_preset_mode = PRESET_NONE
             self._target_temp = self._saved_target_temp
-            await self._async_control_heating()
+            await self._debouncer.async_call()
         else:
             if self._attr_preset_mode == PRESET_NONE:
                 self._saved_target_temp = self._target_temp
             self._attr_preset_mode = preset_mode
             self._target_temp = self._presets[preset_mode]
-            await self._async_control_heating()
+            await self._debouncer.async_call()
         self.async_write_ha_state()